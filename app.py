@@ -8,11 +8,13 @@ from llm import (
     search_book_indexes,
     stitch_response,
 )
+from ollama_client import start_warmup
 from vector_store import get_page_image_paths
 import random
 from constants import model_r1, model, model_manim
 
 st.set_page_config(page_title="Ask the Book", layout="wide")
+start_warmup()
 st.title("📄 Ask the Book")
 query = st.text_input("Enter your question")
 
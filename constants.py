@@ -17,3 +17,13 @@ subject_descriptions = {
 model = "gemma3:4b"
 model_r1 = "deepseek-r1:8b"
 model_manim = "hf.co/mombip/Llama-3.1-8B-q4_k_m-manim:latest"
+
+ollama_keep_alive = "30m"
+# Read timeout; None waits for long generations on slow hardware
+ollama_timeout = None
+ollama_connect_timeout = 5
+ollama_max_connections = 10
+ollama_max_retries = 3
+ollama_retry_backoff = 1.0
+ollama_model_concurrency = {model: 2, model_r1: 1, model_manim: 1}
+warmup_models = [model, model_r1]
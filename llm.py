@@ -1,8 +1,8 @@
 import os
-import ollama
 from constants import subject_descriptions, subjects
 from vector_store import query_vector_store, get_page, get_page_image_paths
 from constants import pdfs_path, model, model_manim, model_r1, temp_path
+from ollama_client import chat, list_models
 import json
 from pydantic import BaseModel
 from typing import List
@@ -13,7 +13,7 @@ from langchain_core.output_parsers.string import StrOutputParser
 
 
 def get_models_list():
-    models_response = ollama.list()
+    models_response = list_models()
     print(models_response.models)
     models = []
     for model in models_response.models:
@@ -26,8 +26,8 @@ def generate_response(model_name, prompt, images_path=[]):
     for path in images_path:
         with open(path, "rb") as img:
             images.append(img.read())
-    response = ollama.chat(
-        model=model_name,
+    response = chat(
+        model_name=model_name,
         messages=[{"role": "user", "content": prompt, "images": images}],
     )
     return response.message.content
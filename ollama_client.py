@@ -0,0 +1,115 @@
+import time
+import threading
+import httpx
+import ollama
+from constants import (
+    ollama_keep_alive,
+    ollama_timeout,
+    ollama_connect_timeout,
+    ollama_max_connections,
+    ollama_max_retries,
+    ollama_retry_backoff,
+    ollama_model_concurrency,
+    warmup_models,
+)
+
+if ollama_max_retries < 0:
+    raise ValueError(f"ollama_max_retries must be >= 0, got {ollama_max_retries}")
+
+
+def create_client(host=None):
+    # host=None lets ollama resolve OLLAMA_HOST (default http://localhost:11434)
+    return ollama.Client(
+        host=host,
+        timeout=httpx.Timeout(ollama_timeout, connect=ollama_connect_timeout),
+        limits=httpx.Limits(
+            max_connections=ollama_max_connections,
+            max_keepalive_connections=ollama_max_connections,
+        ),
+    )
+
+
+client = create_client()
+
+model_locks = {}
+model_locks_guard = threading.Lock()
+
+warmup_thread = None
+warmup_done = False
+warmup_guard = threading.Lock()
+
+
+def get_model_lock(model_name):
+    with model_locks_guard:
+        if model_name not in model_locks:
+            limit = ollama_model_concurrency.get(model_name, 1)
+            model_locks[model_name] = threading.BoundedSemaphore(limit)
+        return model_locks[model_name]
+
+
+def is_retryable(error):
+    # Timeouts are not retried: a slow generation would just run again
+    if isinstance(error, ollama.ResponseError):
+        return error.status_code in (429, 503)
+    return isinstance(error, (ConnectionError, httpx.ConnectError))
+
+
+def call_with_retries(func, **kwargs):
+    attempt = 0
+    while True:
+        try:
+            return func(**kwargs)
+        except Exception as e:
+            if attempt >= ollama_max_retries or not is_retryable(e):
+                raise
+            delay = ollama_retry_backoff * (2**attempt)
+            print(f"Ollama request failed ({e}), retrying in {delay}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+def chat(model_name, messages):
+    # The model lock is held per attempt so backoff sleeps don't block others
+    def request():
+        with get_model_lock(model_name):
+            return client.chat(
+                model=model_name,
+                messages=messages,
+                keep_alive=ollama_keep_alive,
+            )
+
+    return call_with_retries(request)
+
+
+def list_models():
+    return call_with_retries(client.list)
+
+
+def warmup_models_list(models=warmup_models):
+    # An empty chat request makes Ollama load the model and keep it resident
+    success = True
+    for model_name in models:
+        try:
+            chat(model_name=model_name, messages=[])
+            print(f"Model {model_name} warmed up")
+        except Exception as e:
+            print(f"Warmup failed for {model_name}: {e}")
+            success = False
+    return success
+
+
+def run_warmup(models):
+    global warmup_done
+    success = warmup_models_list(models)
+    with warmup_guard:
+        warmup_done = success
+
+
+def start_warmup(models=warmup_models):
+    # Runs in the background; a failed warmup is retried on the next call
+    global warmup_thread
+    with warmup_guard:
+        if warmup_done or (warmup_thread is not None and warmup_thread.is_alive()):
+            return
+        warmup_thread = threading.Thread(target=run_warmup, args=(models,), daemon=True)
+        warmup_thread.start()
@@ -0,0 +1,208 @@
+import importlib
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import ollama
+import pytest
+
+import constants
+import ollama_client
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    # Class attributes are reset by the stub_server fixture for every test
+    requests = []
+    statuses = []
+    delay = 0
+    in_flight = 0
+    max_in_flight = 0
+    guard = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        stub = type(self)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with stub.guard:
+            stub.requests.append(body)
+            status = stub.statuses.pop(0) if stub.statuses else 200
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+        time.sleep(stub.delay)
+        with stub.guard:
+            stub.in_flight -= 1
+
+        if status == 200:
+            payload = {
+                "model": body["model"],
+                "created_at": "2025-01-01T00:00:00Z",
+                "done": True,
+                "message": {"role": "assistant", "content": "ok"},
+            }
+        else:
+            payload = {"error": f"stub status {status}"}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    StubOllama.requests = []
+    StubOllama.statuses = []
+    StubOllama.delay = 0
+    StubOllama.in_flight = 0
+    StubOllama.max_in_flight = 0
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllama)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    host = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(ollama_client, "client", ollama_client.create_client(host))
+    monkeypatch.setattr(ollama_client, "ollama_retry_backoff", 0)
+    monkeypatch.setattr(ollama_client, "model_locks", {})
+    yield StubOllama
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_chat_retries_then_succeeds(stub_server):
+    stub_server.statuses = [503, 429]
+
+    response = ollama_client.chat(
+        model_name="gemma3:4b", messages=[{"role": "user", "content": "hi"}]
+    )
+
+    assert response.message.content == "ok"
+    assert len(stub_server.requests) == 3
+    assert all(
+        r["keep_alive"] == ollama_client.ollama_keep_alive
+        for r in stub_server.requests
+    )
+
+
+def test_chat_does_not_retry_not_found(stub_server):
+    stub_server.statuses = [404]
+
+    with pytest.raises(ollama.ResponseError) as error:
+        ollama_client.chat(model_name="missing", messages=[])
+
+    assert error.value.status_code == 404
+    assert len(stub_server.requests) == 1
+
+
+def test_chat_gives_up_after_max_retries(stub_server, monkeypatch):
+    monkeypatch.setattr(ollama_client, "ollama_max_retries", 2)
+    stub_server.statuses = [503, 503, 503, 503]
+
+    with pytest.raises(ollama.ResponseError):
+        ollama_client.chat(model_name="gemma3:4b", messages=[])
+
+    assert len(stub_server.requests) == 3
+
+
+def test_chat_retries_connection_errors(monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    client = ollama_client.create_client(f"http://127.0.0.1:{port}")
+    original_chat = client.chat
+    attempts = []
+
+    def counting_chat(**kwargs):
+        attempts.append(kwargs["model"])
+        return original_chat(**kwargs)
+
+    monkeypatch.setattr(ollama_client, "client", client)
+    monkeypatch.setattr(client, "chat", counting_chat, raising=False)
+    monkeypatch.setattr(ollama_client, "ollama_retry_backoff", 0)
+    monkeypatch.setattr(ollama_client, "ollama_max_retries", 2)
+
+    with pytest.raises(ConnectionError):
+        ollama_client.chat(model_name="gemma3:4b", messages=[])
+
+    assert len(attempts) == 3
+
+
+def test_client_timeouts():
+    timeout = ollama_client.create_client("http://127.0.0.1:1")._client.timeout
+
+    assert timeout.connect == constants.ollama_connect_timeout
+    assert timeout.read == constants.ollama_timeout
+
+
+def test_negative_max_retries_is_rejected_on_import(monkeypatch):
+    monkeypatch.setattr(constants, "ollama_max_retries", -1)
+    try:
+        with pytest.raises(ValueError):
+            importlib.reload(ollama_client)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(ollama_client)
+
+
+def test_warmup_sends_empty_messages(stub_server):
+    assert ollama_client.warmup_models_list(["gemma3:4b", "deepseek-r1:8b"])
+
+    assert [r["model"] for r in stub_server.requests] == [
+        "gemma3:4b",
+        "deepseek-r1:8b",
+    ]
+    for r in stub_server.requests:
+        assert r["messages"] == []
+        assert r["keep_alive"] == ollama_client.ollama_keep_alive
+
+
+def test_warmup_reports_failure(stub_server):
+    stub_server.statuses = [404]
+
+    assert not ollama_client.warmup_models_list(["missing"])
+
+
+def test_model_concurrency_limit(stub_server, monkeypatch):
+    monkeypatch.setattr(ollama_client, "ollama_model_concurrency", {"limited": 2})
+    stub_server.delay = 0.2
+
+    threads = [
+        threading.Thread(
+            target=ollama_client.chat,
+            kwargs={"model_name": "limited", "messages": []},
+        )
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(stub_server.requests) == 5
+    assert stub_server.max_in_flight == 2
+
+
+def test_start_warmup_retries_after_failure(stub_server, monkeypatch):
+    monkeypatch.setattr(ollama_client, "warmup_thread", None)
+    monkeypatch.setattr(ollama_client, "warmup_done", False)
+    stub_server.statuses = [404]
+
+    ollama_client.start_warmup(["gemma3:4b"])
+    ollama_client.warmup_thread.join()
+    assert not ollama_client.warmup_done
+
+    ollama_client.start_warmup(["gemma3:4b"])
+    ollama_client.warmup_thread.join()
+    assert ollama_client.warmup_done
+    assert len(stub_server.requests) == 2
+
+    ollama_client.start_warmup(["gemma3:4b"])
+    ollama_client.warmup_thread.join()
+    assert len(stub_server.requests) == 2